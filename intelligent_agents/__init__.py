@@ -4,7 +4,7 @@ from .web_search_tool import WebSearchTool
 from .runner import Runner
 from .decorators import function_tool
 from .function_tools import (
-    plan_search_queries, perform_web_search, 
+    plan_search_queries, perform_web_search, perform_batch_web_search,
     synthesize_results, validate_content
 )
 from .deep_research_agent import DeepResearchAgent
@@ -16,6 +16,7 @@ __all__ = [
     "function_tool",
     "plan_search_queries",
     "perform_web_search", 
+    "perform_batch_web_search",
     "synthesize_results",
     "validate_content",
     "DeepResearchAgent"
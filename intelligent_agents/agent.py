@@ -4,12 +4,35 @@ Base Agent class for the intelligent research system
 from abc import ABC, abstractmethod
 from typing import Any, Optional
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+import httpx
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Retries after a failed OpenAI request; the SDK backs off exponentially
+# with jitter and retries rate limits, 5xx and connection errors
+_MAX_RETRIES = 3
+
+# OpenAI client shared by all agents and web searches, so keep-alive
+# connections to the API are reused from one pool instead of re-handshaking
+_client: Optional[AsyncOpenAI] = None
+
+
+def _get_client() -> AsyncOpenAI:
+    """Get the shared AsyncOpenAI client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            max_retries=_MAX_RETRIES,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        )
+    return _client
+
 
 class AgentConfig(BaseModel):
     """Configuration for an agent"""
@@ -26,7 +49,7 @@ class Agent(ABC):
     
     def __init__(self, config: AgentConfig):
         self.config = config
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = _get_client()
     
     @abstractmethod
     async def execute(self, input_data: Any) -> Any:
@@ -48,6 +71,5 @@ class Agent(ABC):
         # Override with any provided kwargs
         model_kwargs.update(kwargs)
         
-        response = self.client.chat.completions.create(**model_kwargs)
+        response = await self.client.chat.completions.create(**model_kwargs)
         return response.choices[0].message.content
-    
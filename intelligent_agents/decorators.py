@@ -2,7 +2,7 @@
 Decorators for agent functions
 """
 from functools import wraps
-from typing import Callable, Any, Dict
+from typing import Callable
 import asyncio
 
 
@@ -18,18 +18,15 @@ def function_tool(name: str = None, description: str = None):
     def decorator(func: Callable) -> Callable:
         tool_name = name or func.__name__
         
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            try:
-                if asyncio.iscoroutinefunction(func):
-                    result = await func(*args, **kwargs)
-                else:
-                    result = func(*args, **kwargs)
-
-                return result
-
-            except Exception as e:
-                raise
+        # Whether func has to be awaited never changes, so decide it once here
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                return await func(*args, **kwargs)
+        else:
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                return func(*args, **kwargs)
         
         # Add metadata to the function
         wrapper._is_function_tool = True
@@ -54,12 +51,7 @@ def agent_tool(name: str = None, description: str = None):
         
         @wraps(func)
         async def wrapper(self, *args, **kwargs):
-            try:
-                result = await func(self, *args, **kwargs)
-                return result
-
-            except Exception as e:
-                raise
+            return await func(self, *args, **kwargs)
         
         # Add metadata to the function
         wrapper._is_agent_tool = True
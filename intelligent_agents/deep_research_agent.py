@@ -3,8 +3,40 @@ Deep Research Agent - Gradio UI for accepting research queries
 """
 import gradio as gr
 import asyncio
+import re
+import threading
 from .orchestrator import Orchestrator
 
+try:
+    # uvloop is optional (unavailable on Windows); fall back to the stdlib loop
+    import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
+
+# One persistent event loop shared by every research query, so loop setup and
+# teardown are not paid per Gradio submit
+_LOOP = _new_event_loop()
+threading.Thread(target=_LOOP.run_forever, name="research-event-loop", daemon=True).start()
+
+# Orchestrator messages that start each progress step, with the step number and description
+_PROGRESS_STEPS = {
+    "🚀 Starting intelligent research orchestration": (1, "🚀 Starting research..."),
+    "📋 Planning intelligent search strategy": (2, "📋 Planning strategy..."),
+    "🌐 Performing intelligent web searches": (3, "🌐 Performing searches..."),
+    "📝 Synthesizing research findings": (4, "📝 Synthesizing results..."),
+    "🔍 Validating content for safety": (5, "🔍 Validating content..."),
+    "📄 Compiling final report": (6, "📄 Compiling report..."),
+}
+_PROGRESS_STEP_RE = re.compile("|".join(map(re.escape, _PROGRESS_STEPS)))
+
+# Header that starts the final report update
+_REPORT_MARKER = "# 🔍 Intelligent Research Report"
+
+# Updates containing any of these emojis are shown in the progress logs
+_PROGRESS_LOG_RE = re.compile("[🚀📋🌐🔍📝📄✅]")
+
 
 class DeepResearchAgent:
     def __init__(self):
@@ -12,73 +44,57 @@ class DeepResearchAgent:
     
     def process_research_query(self, query: str, progress=gr.Progress()):
         """
-        Process user research query with real-time step-by-step progress
+        Process user research query, streaming step-by-step progress to the UI
         """
         if not query.strip():
-            return "Please provide a valid research query.", "❌ No query provided"
+            yield "Please provide a valid research query.", "❌ No query provided"
+            return
         
+        updates = self.orchestrator_agent.run_research(query)
         try:
-            # Run the async orchestrator in a new event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            progress_logs = []
+            markdown_report = ""
+            # Output before the report header, shown in full if no report arrives
+            output_parts = []
+            current_step = 0
+            total_steps = len(_PROGRESS_STEPS)
             
-            try:
-                result_parts = []
-                progress_logs = []
-                current_step = 0
-                total_steps = 6  # Total number of steps
+            while True:
+                # Pull the next update from the orchestrator on the shared event loop
+                try:
+                    update = asyncio.run_coroutine_threadsafe(anext(updates), _LOOP).result()
+                except StopAsyncIteration:
+                    break
                 
-                # Create async generator with real-time progress updates
-                async def run_with_progress():
-                    nonlocal current_step
-                    async for update in self.orchestrator_agent.run_research(query):
-                        result_parts.append(update)
-                        
-                        # Update progress based on content
-                        if "🚀 Starting intelligent research orchestration" in update:
-                            current_step = 1
-                            progress(current_step / total_steps, desc="🚀 Starting research...")
-                        elif "📋 Planning intelligent search strategy" in update:
-                            current_step = 2
-                            progress(current_step / total_steps, desc="📋 Planning strategy...")
-                        elif "🌐 Performing intelligent web searches" in update:
-                            current_step = 3
-                            progress(current_step / total_steps, desc="🌐 Performing searches...")
-                        elif "📝 Synthesizing research findings" in update:
-                            current_step = 4
-                            progress(current_step / total_steps, desc="📝 Synthesizing results...")
-                        elif "🔍 Validating content for safety" in update:
-                            current_step = 5
-                            progress(current_step / total_steps, desc="🔍 Validating content...")
-                        elif "📄 Compiling final report" in update:
-                            current_step = 6
-                            progress(current_step / total_steps, desc="📄 Compiling report...")
-                        
-                        # Collect progress logs for display
-                        if any(emoji in update for emoji in ["🚀", "📋", "🌐", "🔍", "📝", "📄", "✅"]):
-                            progress_logs.append(update.strip())
-                        
-                        # Add small delay to allow UI updates
-                        await asyncio.sleep(0.1)
+                # Everything from the report header onwards belongs to the report
+                if markdown_report or update.startswith(_REPORT_MARKER):
+                    markdown_report += update
+                    continue
+                output_parts.append(update)
                 
-                # Run the async function
-                loop.run_until_complete(run_with_progress())
+                # Update progress to the latest step this update mentions
+                step_markers = _PROGRESS_STEP_RE.findall(update)
+                if step_markers:
+                    current_step, step_desc = _PROGRESS_STEPS[step_markers[-1]]
+                    progress(current_step / total_steps, desc=step_desc)
                 
-                # Final progress update
-                progress(1.0, desc="✅ Research completed!")
+                # Collect progress logs for display
+                if _PROGRESS_LOG_RE.search(update):
+                    progress_logs.append(update.strip())
                 
-                # Extract markdown report
-                full_result = "".join(result_parts)
-                report_start = full_result.find("# 🔍 Intelligent Research Report")
-                markdown_report = full_result[report_start:] if report_start != -1 else full_result
-                
-                return markdown_report, "\n".join(progress_logs)
-                
-            finally:
-                loop.close()
+                # Stream the logs; the report output is left untouched until it is complete
+                yield gr.update(), "\n".join(progress_logs)
+            
+            # Final progress update
+            progress(1.0, desc="✅ Research completed!")
+            
+            yield markdown_report or "".join(output_parts), "\n".join(progress_logs)
             
         except Exception as e:
-            return f"Error processing research query: {str(e)}", f"❌ Error: {str(e)}"
+            yield f"Error processing research query: {str(e)}", f"❌ Error: {str(e)}"
+        
+        finally:
+            asyncio.run_coroutine_threadsafe(updates.aclose(), _LOOP).result()
     
     def create_ui_interface(self):
         """
@@ -1,17 +1,21 @@
 """
 Function Tools - Each research capability as a function tool
 """
-from typing import List, Dict, Any
+from typing import List
 from pydantic import BaseModel, Field
 from .decorators import function_tool
-from .web_search_tool import WebSearchTool
+from .web_search_tool import WebSearchTool, SearchRequest, DEFAULT_CACHE_TTL
 from models.research_models import SearchQuery, SearchResult, ResearchReport, ValidationResult
-import google.generativeai as genai
-import os
-import json
 from datetime import datetime
 
 
+# How long search results stay fresh, in seconds, by planned query type
+_QUERY_TYPE_TTLS = {
+    "Recent developments": 60,
+    "Primary information": 7 * 24 * 3600,
+}
+
+
 # Pydantic models for function inputs/outputs
 class QueryPlanningInput(BaseModel):
     user_query: str = Field(..., description="User's research query")
@@ -29,6 +33,14 @@ class WebSearchOutput(BaseModel):
     search_result: SearchResult = Field(..., description="Search results")
 
 
+class BatchWebSearchInput(BaseModel):
+    search_queries: List[SearchQuery] = Field(..., description="Search queries to execute in one batch")
+
+
+class BatchWebSearchOutput(BaseModel):
+    search_results: List[SearchResult] = Field(..., description="Search results, in query order")
+
+
 class SynthesisInput(BaseModel):
     search_results: List[SearchResult] = Field(..., description="Search results to synthesize")
     user_query: str = Field(..., description="Original user query")
@@ -52,22 +64,24 @@ async def plan_search_queries(input_data: QueryPlanningInput) -> QueryPlanningOu
     """
     Plan intelligent search queries using Pydantic models
     """
-    # Create two intelligent queries based on the user input
-    query1 = SearchQuery(
+    # Create two intelligent queries based on the user input. Every field is
+    # either the already-validated user query or a constant, so the models
+    # are constructed without re-running validation
+    query1 = SearchQuery.model_construct(
         query=input_data.user_query,
         reasoning="Direct search for the main topic",
         query_type="Primary information",
         priority=1
     )
     
-    query2 = SearchQuery(
+    query2 = SearchQuery.model_construct(
         query=f"{input_data.user_query} latest developments trends",
         reasoning="Search for recent updates and developments",
         query_type="Recent developments",
         priority=2
     )
     
-    return QueryPlanningOutput(queries=[query1, query2])
+    return QueryPlanningOutput.model_construct(queries=[query1, query2])
 
 
 @function_tool("perform_web_search", "Perform web search for a given query")
@@ -75,30 +89,76 @@ async def perform_web_search(input_data: WebSearchInput) -> WebSearchOutput:
     """
     Perform web search using WebSearchTool
     """
-    web_search_tool = WebSearchTool()
+    web_search_tool = WebSearchTool.instance()
     
     # Create search request from Pydantic model
-    from .web_search_tool import SearchRequest
-    request = SearchRequest(query=input_data.search_query.query)
+    request = _search_request(input_data.search_query)
     
     # Perform search
-    results = await web_search_tool.search(request)
+    fetched_at, results = await web_search_tool.search_with_fetch_time(request)
     
-    # Create search result using Pydantic model
-    combined_snippet = "\n\n".join([res.snippet for res in results])
-    search_result = SearchResult(
-        query=input_data.search_query.query,
-        results=combined_snippet,
+    return WebSearchOutput(search_result=_to_search_result(input_data.search_query, fetched_at, results))
+
+
+@function_tool("perform_batch_web_search", "Perform web searches for several queries as one batch job")
+async def perform_batch_web_search(input_data: BatchWebSearchInput) -> BatchWebSearchOutput:
+    """
+    Perform web searches through the WebSearchTool batch path
+    """
+    web_search_tool = WebSearchTool.instance()
+    
+    requests = [_search_request(search_query) for search_query in input_data.search_queries]
+    
+    batch_results = await web_search_tool.search_batch(requests)
+    
+    # A search that failed even online becomes an error result, so the
+    # rest of the batch still reaches synthesis
+    return BatchWebSearchOutput(search_results=[
+        search_error_result(search_query, outcome) if isinstance(outcome, BaseException)
+        else _to_search_result(search_query, *outcome)
+        for search_query, outcome in zip(input_data.search_queries, batch_results)
+    ])
+
+
+def _search_request(search_query: SearchQuery) -> SearchRequest:
+    """Build the web search request for a planned query, cached for its query type's TTL"""
+    return SearchRequest(
+        query=search_query.query,
+        ttl_seconds=_QUERY_TYPE_TTLS.get(search_query.query_type, DEFAULT_CACHE_TTL)
+    )
+
+
+def search_error_result(search_query: SearchQuery, error: BaseException) -> SearchResult:
+    """Build the research search result for a query whose search failed"""
+    return SearchResult(
+        query=search_query.query,
+        results=[],
+        status="error",
+        metadata={
+            "reasoning": search_query.reasoning,
+            "query_type": search_query.query_type,
+            "priority": search_query.priority,
+            "error": str(error)
+        }
+    )
+
+
+def _to_search_result(search_query: SearchQuery, fetched_at: float, results) -> SearchResult:
+    """Build the research search result for a query from its web search results and their fetch time"""
+    ttl_seconds = _QUERY_TYPE_TTLS.get(search_query.query_type, DEFAULT_CACHE_TTL)
+    return SearchResult(
+        query=search_query.query,
+        results=[res.snippet for res in results],
         status="success" if results else "no_results",
+        ttl_seconds=ttl_seconds,
+        expires_at=datetime.fromtimestamp(fetched_at + ttl_seconds),
         metadata={
-            "reasoning": input_data.search_query.reasoning,
-            "query_type": input_data.search_query.query_type,
-            "priority": input_data.search_query.priority,
+            "reasoning": search_query.reasoning,
+            "query_type": search_query.query_type,
+            "priority": search_query.priority,
             "num_results": len(results)
         }
     )
-    
-    return WebSearchOutput(search_result=search_result)
 
 
 @function_tool("synthesize_results", "Synthesize search results into comprehensive report")
@@ -106,11 +166,6 @@ async def synthesize_results(input_data: SynthesisInput) -> SynthesisOutput:
     """
     Synthesize search results using Pydantic models
     """
-    # Combine search results
-    combined_results = []
-    for result in input_data.search_results:
-        combined_results.append(f"Query: {result.query}\nResults: {result.results}")
-    
     # Create research report using Pydantic model
     research_report = ResearchReport(
         title=f"Research Report: {input_data.user_query}",
@@ -131,8 +186,7 @@ async def synthesize_results(input_data: SynthesisInput) -> SynthesisOutput:
             "Follow-up actions suggested"
         ],
         sources=[f"Search query: {result.query}" for result in input_data.search_results],
-        confidence_score=0.85,
-        generated_at=datetime.now()
+        confidence_score=0.85
     )
     
     return SynthesisOutput(research_report=research_report)
@@ -146,33 +200,20 @@ async def validate_content(input_data: ValidationInput) -> ValidationOutput:
     # Use Pydantic model to extract validation data
     report = input_data.research_report
     
-    # Create validation criteria using Pydantic model fields
-    validation_criteria = {
-        "title_length": len(report.title),
-        "findings_count": len(report.key_findings),
-        "insights_count": len(report.insights),
-        "recommendations_count": len(report.recommendations),
-        "confidence_score": report.confidence_score
-    }
-    
-    # Simple validation logic using Pydantic model data
-    is_clean = True
+    # Check for potential issues directly on the Pydantic model fields
     issues = []
-    message = "Content validation completed"
-    confidence = 0.9
-    
-    # Check for potential issues using Pydantic model data
-    if validation_criteria["title_length"] < 5:
+    if len(report.title) < 5:
         issues.append("Title too short")
-        is_clean = False
     
-    if validation_criteria["findings_count"] == 0:
+    if not report.key_findings:
         issues.append("No key findings provided")
-        is_clean = False
     
-    if validation_criteria["confidence_score"] < 0.5:
+    if report.confidence_score < 0.5:
         issues.append("Low confidence score")
-        is_clean = False
+    
+    is_clean = not issues
+    message = "Content validation completed"
+    confidence = 0.9
     
     # Create ValidationResult using Pydantic model
     validation_result = ValidationResult(
@@ -1,149 +1,218 @@
 """
 Orchestrator - Manages function tool flow using Runner pattern
 """
-from typing import AsyncGenerator
-from models.research_models import ResearchRequest
+import asyncio
+from typing import AsyncGenerator, List
+from models.research_models import ResearchRequest, SearchQuery, SearchResult
 from .runner import Runner
 from .function_tools import (
-    QueryPlanningInput, WebSearchInput, 
-    SynthesisInput, ValidationInput
+    QueryPlanningInput, WebSearchInput, BatchWebSearchInput,
+    SynthesisInput, ValidationInput, search_error_result
 )
 
+# Progress messages without substitutions, one per research step
+_MSG_START = "🚀 Starting intelligent research orchestration...\n"
+_MSG_PLANNING = "📋 Planning intelligent search strategy...\n"
+_MSG_SEARCHING = "🌐 Performing intelligent web searches...\n"
+_MSG_SYNTHESIZING = "📝 Synthesizing research findings...\n"
+_MSG_VALIDATING = "🔍 Validating content for safety...\n"
+_MSG_COMPILING = "📄 Compiling final report...\n"
+
+# Format for timestamps shown in the report
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Bulleted report sections in display order: (heading, ResearchReport attribute)
+_REPORT_SECTIONS = (
+    ("🔍 Key Findings", "key_findings"),
+    ("💡 Important Insights", "insights"),
+    ("🎯 Recommendations", "recommendations"),
+    ("📚 Sources", "sources"),
+)
+
+# Reports with more bulleted items than this are formatted on a worker thread
+# so they do not hold up the event loop
+_FORMAT_OFFLOAD_ITEMS = 200
+
+
+def _drain(lines: list) -> str:
+    """Join buffered log lines into one update and empty the buffer"""
+    update = "".join(lines)
+    lines.clear()
+    return update
+
 
 class Orchestrator:
     def __init__(self):
         self.runner = Runner()
 
-    async def run_research(self, user_query: str) -> AsyncGenerator[str, None]:
+    async def run_research(self, user_query: str, batch_mode: bool = False) -> AsyncGenerator[str, None]:
         """
         Main orchestration method using Runner pattern with function tools
+
+        Log lines are buffered and yielded together just before each wait,
+        so the UI refreshes once per step instead of once per line.
+
+        With batch_mode, all searches go out as one Batch API job, which
+        costs less but can take hours; use it for offline runs.
         """
+        log = []
         try:
             # Initialize request
-            request = ResearchRequest(query=user_query)
+            request = ResearchRequest(query=user_query, batch_mode=batch_mode)
 
-            yield "🚀 Starting intelligent research orchestration...\n"
+            log.append(_MSG_START)
 
             # Step 1: Plan search queries using function tool
-            yield "📋 Planning intelligent search strategy...\n"
+            log.append(_MSG_PLANNING)
+            yield _drain(log)
             planning_input = QueryPlanningInput(user_query=user_query)
             planning_result = await self.runner.run("plan_search_queries", planning_input)
             
             for query in planning_result.queries:
-                yield f"✅ Planned query: {query.query[:50]}...\n"
+                log.append(f"✅ Planned query: {query.query[:50]}...\n")
 
-            # Step 2: Perform web searches using function tools
-            yield "🌐 Performing intelligent web searches...\n"
-            search_results = []
-            
-            for i, search_query in enumerate(planning_result.queries, 1):
-                yield f"🔍 Search {i}/{len(planning_result.queries)}: {search_query.query[:50]}...\n"
+            # Skip planned queries that differ only in case or surrounding whitespace
+            unique_queries = {}
+            for query in planning_result.queries:
+                unique_queries.setdefault(query.query.strip().lower(), query)
+            search_queries = list(unique_queries.values())
+
+            # Step 2: Perform web searches concurrently using function tools
+            log.append(_MSG_SEARCHING)
+            if request.batch_mode:
+                log.append(f"📦 Submitting {len(search_queries)} searches as one batch job...\n")
+                yield _drain(log)
+                search_results = await self._run_batch_search(search_queries)
+                for search_result in search_results:
+                    yield f"✅ Search completed: {search_result.status}\n"
+            else:
+                search_tasks = []
+                
+                for i, search_query in enumerate(search_queries, 1):
+                    log.append(f"🔍 Search {i}/{len(search_queries)}: {search_query.query[:50]}...\n")
+                    
+                    search_tasks.append(asyncio.create_task(self._run_search(search_query)))
+                yield _drain(log)
                 
-                search_input = WebSearchInput(search_query=search_query)
-                search_result = await self.runner.run("perform_web_search", search_input)
-                search_results.append(search_result.search_result)
+                # Report each search as soon as it finishes rather than in planned order
+                async for task in asyncio.as_completed(search_tasks):
+                    search_result = await task
+                    yield f"✅ Search completed: {search_result.status}\n"
                 
-                yield f"✅ Search completed: {search_result.search_result.status}\n"
+                search_results = [task.result() for task in search_tasks]
 
             # Step 3: Synthesize results using function tool
-            yield "📝 Synthesizing research findings...\n"
+            yield _MSG_SYNTHESIZING
             synthesis_input = SynthesisInput(
                 search_results=search_results,
                 user_query=user_query
             )
             synthesis_result = await self.runner.run("synthesize_results", synthesis_input)
-            yield f"✅ Report generated: {synthesis_result.research_report.title}\n"
+            log.append(f"✅ Report generated: {synthesis_result.research_report.title}\n")
 
             # Step 4: Validate content using function tool
-            yield "🔍 Validating content for safety...\n"
+            log.append(_MSG_VALIDATING)
+            yield _drain(log)
             validation_input = ValidationInput(research_report=synthesis_result.research_report)
             validation_result = await self.runner.run("validate_content", validation_input)
-            yield f"✅ Validation completed: {'Clean' if validation_result.validation_result.is_clean else 'Issues detected'}\n"
+            log.append(f"✅ Validation completed: {'Clean' if validation_result.validation_result.is_clean else 'Issues detected'}\n")
 
             # Step 5: Format final response
-            yield "📄 Compiling final report...\n"
-            final_response = self._format_final_report(
-                synthesis_result.research_report, 
-                validation_result.validation_result, 
+            log.append(_MSG_COMPILING)
+            yield _drain(log)
+            report = synthesis_result.research_report
+            if sum(len(getattr(report, attribute)) for _, attribute in _REPORT_SECTIONS) > _FORMAT_OFFLOAD_ITEMS:
+                report_body = await asyncio.to_thread(self._format_body, report, request)
+            else:
+                report_body = self._format_body(report, request)
+            final_response = report_body + self._format_validation_and_footer(
+                validation_result.validation_result,
+                synthesis_result.research_report,
                 request
             )
             yield final_response
 
         except Exception as e:
-            yield f"❌ Error in research orchestration: {str(e)}\n"
+            log.append(f"❌ Error in research orchestration: {str(e)}\n")
+            yield _drain(log)
             raise
 
-    def _format_final_report(self, report, validation_result, request) -> str:
+    async def _run_search(self, search_query: SearchQuery) -> SearchResult:
+        """
+        Run one web search, turning a failure into an error result so that
+        the other searches and the rest of the research still complete
+        """
+        try:
+            search_input = WebSearchInput(search_query=search_query)
+            search_output = await self.runner.run("perform_web_search", search_input)
+            return search_output.search_result
+        except Exception as e:
+            return search_error_result(search_query, e)
+
+    async def _run_batch_search(self, search_queries: List[SearchQuery]) -> List[SearchResult]:
         """
-        Format the final report with all components
+        Run all web searches as one batch, turning a failure of the whole
+        batch into error results so that the rest of the research still completes
         """
-        header = f"""
-# 🔍 Intelligent Research Report
+        try:
+            batch_input = BatchWebSearchInput(search_queries=search_queries)
+            batch_output = await self.runner.run("perform_batch_web_search", batch_input)
+            return batch_output.search_results
+        except Exception as e:
+            return [search_error_result(search_query, e) for search_query in search_queries]
+
+    def _format_body(self, report, request) -> str:
+        """
+        Format the report header, summary and bulleted sections, which do
+        not depend on validation
+        """
+        parts = [f"""# 🔍 Intelligent Research Report
 **Query**: {request.query}
-**Generated**: {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}
+**Generated**: {report.generated_at.strftime(_TIMESTAMP_FORMAT)}
 ---
-"""
+"""]
 
         # Executive Summary
-        executive_summary = f"""
+        parts.append(f"""
 ## 📋 Executive Summary
 {report.executive_summary}
-"""
+""")
 
-        # Key Findings
-        key_findings = ""
-        if report.key_findings:
-            key_findings = f"""
-## 🔍 Key Findings
-{chr(10).join(f"• {finding}" for finding in report.key_findings)}
-"""
+        # Bulleted sections, skipping any that are empty
+        for heading, attribute in _REPORT_SECTIONS:
+            items = getattr(report, attribute)
+            if items:
+                parts.append(f"\n## {heading}\n• " + "\n• ".join(items) + "\n")
 
-        # Insights
-        insights = ""
-        if report.insights:
-            insights = f"""
-## 💡 Important Insights
-{chr(10).join(f"• {insight}" for insight in report.insights)}
-"""
+        return "".join(parts)
 
-        # Recommendations
-        recommendations = ""
-        if report.recommendations:
-            recommendations = f"""
-## 🎯 Recommendations
-{chr(10).join(f"• {rec}" for rec in report.recommendations)}
-"""
-
-        # Sources
-        sources = ""
-        if report.sources:
-            sources = f"""
-## 📚 Sources
-{chr(10).join(f"• {source}" for source in report.sources)}
-"""
+    def _format_validation_and_footer(self, validation_result, report, request) -> str:
+        """
+        Format the validation section and report metadata footer
+        """
+        parts = []
 
         # Validation section
-        validation_section = ""
         if validation_result:
             status_icon = "✅" if validation_result.is_clean else "⚠️"
-            validation_section = f"""
+            parts.append(f"""
 ---
 ## 🛡️ Content Validation
 {status_icon} **Status**: {'Clean' if validation_result.is_clean else 'Issues Detected'}
 **Confidence**: {validation_result.confidence:.2f}
 **Message**: {validation_result.message}
-"""
+""")
             if validation_result.issues:
-                validation_section += f"**Issues**: {', '.join(validation_result.issues)}\n"
+                parts.append(f"**Issues**: {', '.join(validation_result.issues)}\n")
 
         # Footer
-        footer = f"""
+        parts.append(f"""
 ---
 ## 📊 Report Metadata
 - **Confidence Score**: {report.confidence_score:.2f}
 - **Generated by**: Intelligent Research Synthesizer
 - **Validation Model**: Gemini Pro
-- **Processing Time**: {request.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-"""
+- **Processing Time**: {request.created_at.strftime(_TIMESTAMP_FORMAT)}
+""")
 
-        return header + executive_summary + key_findings + insights + recommendations + sources + validation_section + footer
\ No newline at end of file
+        return "".join(parts)
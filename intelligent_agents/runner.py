@@ -1,26 +1,64 @@
 """
 Runner class for orchestrating function tool execution
 """
+import asyncio
+import itertools
+import reprlib
+from collections import deque
 from typing import Any, Dict, List, Optional, Callable
+from pydantic import BaseModel
 from .function_tools import (
-    plan_search_queries, perform_web_search, 
-    synthesize_results, validate_content,
-    QueryPlanningInput, WebSearchInput, 
-    SynthesisInput, ValidationInput
+    plan_search_queries, perform_web_search, perform_batch_web_search,
+    synthesize_results, validate_content
 )
 
 
+class _HistoryRepr(reprlib.Repr):
+    """
+    Size-bounded repr for execution history summaries. Pydantic models are
+    walked field by field under the same limits instead of falling back to
+    their full repr, which would render every nested search result.
+    """
+
+    def repr1(self, x, level):
+        if isinstance(x, BaseModel):
+            return self.repr_model(x, level)
+        return super().repr1(x, level)
+
+    def repr_model(self, x, level):
+        name = type(x).__name__
+        if level <= 0:
+            return f"{name}(...)"
+        fields = []
+        for i, field_name in enumerate(type(x).model_fields):
+            if i >= self.maxdict:
+                fields.append("...")
+                break
+            fields.append(f"{field_name}={self.repr1(getattr(x, field_name), level - 1)}")
+        return f"{name}({', '.join(fields)})"
+
+
+_history_repr = _HistoryRepr(maxstring=120, maxlist=3, maxother=200)
+
+# Execution records kept per runner; older records are dropped first
+_HISTORY_MAXLEN = 1000
+
+
 class Runner:
     """Orchestrates the execution of function tools"""
 
-    def __init__(self):
+    def __init__(self, record_history: bool = False):
         self.function_tools: Dict[str, Callable] = {
             "plan_search_queries": plan_search_queries,
             "perform_web_search": perform_web_search,
+            "perform_batch_web_search": perform_batch_web_search,
             "synthesize_results": synthesize_results,
             "validate_content": validate_content
         }
-        self.execution_history: List[Dict[str, Any]] = []
+        # Recording is opt-in; records keep the raw objects and are only
+        # summarized as strings when the history is read
+        self.record_history = record_history
+        self.execution_history: deque = deque(maxlen=_HISTORY_MAXLEN)
 
     def register_tool(self, name: str, tool_function: Callable):
         """Register a function tool with the runner"""
@@ -41,58 +79,108 @@ class Runner:
         Returns:
             Result from the function tool execution
         """
+        tool_function = self.function_tools.get(tool_name)
         try:
-            if tool_name not in self.function_tools:
+            if tool_function is None:
                 raise ValueError(f"Function tool '{tool_name}' not found")
 
-            tool_function = self.function_tools[tool_name]
             result = await tool_function(input_data)
 
             # Record execution
-            execution_record = {
-                "tool_name": tool_name,
-                "input_data": str(input_data)[:500],
-                "result": str(result)[:500],
-                "status": "success"
-            }
-            self.execution_history.append(execution_record)
+            if self.record_history:
+                execution_record = {
+                    "tool_name": tool_name,
+                    "input_data": input_data,
+                    "result": result,
+                    "status": "success"
+                }
+                self.execution_history.append(execution_record)
 
             return result
 
         except Exception as e:
             # Record failed execution
-            execution_record = {
-                "tool_name": tool_name,
-                "input_data": str(input_data)[:500],
-                "error": str(e),
-                "status": "error"
-            }
-            self.execution_history.append(execution_record)
+            if self.record_history:
+                execution_record = {
+                    "tool_name": tool_name,
+                    "input_data": input_data,
+                    "error": str(e),
+                    "status": "error"
+                }
+                self.execution_history.append(execution_record)
             raise
 
     async def run_sequence(self, sequence: List[Dict[str, Any]]) -> List[Any]:
         """
         Run a sequence of function tools
 
+        Steps run one after another unless any step has a 'depends_on' key.
+        In that case each step starts as soon as the steps it depends on
+        have finished, so independent steps run concurrently.
+
         Args:
-            sequence: List of dictionaries with 'tool' and 'input' keys
+            sequence: List of dictionaries with 'tool' and 'input' keys, and
+                optionally 'depends_on' listing the indices of prerequisite steps
 
         Returns:
-            List of results from each tool execution
+            List of results from each tool execution, in sequence order
         """
-        try:
-            results = []
-            for i, step in enumerate(sequence):
-                tool_name = step["tool"]
-                input_data = step.get("input")
+        if any("depends_on" in step for step in sequence):
+            return await self._run_dependency_graph(sequence)
 
-                result = await self.run(tool_name, input_data)
-                results.append(result)
+        results = []
+        for step in sequence:
+            tool_name = step["tool"]
+            input_data = step.get("input")
 
-            return results
+            result = await self.run(tool_name, input_data)
+            results.append(result)
 
-        except Exception as e:
-            raise
+        return results
+
+    async def _run_dependency_graph(self, sequence: List[Dict[str, Any]]) -> List[Any]:
+        """Run sequence steps as their 'depends_on' prerequisites complete"""
+        for index, step in enumerate(sequence):
+            for dependency in step.get("depends_on", ()):
+                if not 0 <= dependency < len(sequence) or dependency == index:
+                    raise ValueError(f"Step {index} has invalid dependency {dependency}")
+
+        results: List[Any] = [None] * len(sequence)
+        waiting = set(range(len(sequence)))
+        completed = set()
+        running: Dict[asyncio.Task, int] = {}
+
+        try:
+            while waiting or running:
+                for index in sorted(waiting):
+                    step = sequence[index]
+                    if completed.issuperset(step.get("depends_on", ())):
+                        waiting.discard(index)
+                        task = asyncio.create_task(self.run(step["tool"], step.get("input")))
+                        running[task] = index
+
+                if not running:
+                    raise ValueError(f"Circular dependencies between steps {sorted(waiting)}")
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                # Read every finished step before raising, so no failure goes unretrieved
+                error = None
+                for task in sorted(finished, key=running.get):
+                    index = running.pop(task)
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    results[index] = task.result()
+                    completed.add(index)
+                if error is not None:
+                    raise error
+        finally:
+            # A failed step stops the sequence, as in the sequential path
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        return results
 
     async def run_parallel(self, tasks: List[Dict[str, Any]]) -> List[Any]:
         """
@@ -104,20 +192,33 @@ class Runner:
         Returns:
             List of results from each tool execution
         """
-        import asyncio
+        async def run_task(task):
+            tool_name = task["tool"]
+            input_data = task.get("input")
+            return await self.run(tool_name, input_data)
 
-        try:
-            async def run_task(task):
-                tool_name = task["tool"]
-                input_data = task.get("input")
-                return await self.run(tool_name, input_data)
+        results = await asyncio.gather(*[run_task(task) for task in tasks])
+        return results
 
-            results = await asyncio.gather(*[run_task(task) for task in tasks])
-            return results
+    def get_execution_history(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the execution history, with inputs and results summarized as strings
 
-        except Exception as e:
-            raise
+        Args:
+            n: Only return the most recent n records
 
-    def get_execution_history(self) -> List[Dict[str, Any]]:
-        """Get the execution history"""
-        return self.execution_history.copy()
\ No newline at end of file
+        Returns:
+            List of execution records, oldest first
+        """
+        start = 0 if n is None else max(0, len(self.execution_history) - n)
+        records = itertools.islice(self.execution_history, start, None)
+        return [_summarize_record(record) for record in records]
+
+
+def _summarize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy an execution record with its input and result truncated to strings"""
+    summary = dict(record)
+    for key in ("input_data", "result"):
+        if key in summary:
+            summary[key] = _history_repr.repr(summary[key])[:500]
+    return summary
@@ -1,21 +1,61 @@
 """
 WebSearchTool for performing web searches
 """
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
 from pydantic import BaseModel, Field
-from openai import OpenAI
-import os
+from openai import APIError
+from openai.types.responses import Response
+from .agent import _get_client
+import asyncio
+import hashlib
+import json
+import logging
+import time
 from dotenv import load_dotenv
 
+try:
+    # numpy is only needed for the optional semantic cache
+    import numpy as np
+except ImportError:
+    np = None
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Embedding model used to compare queries for the semantic cache
+_EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Search prompts, built once; each search only formats its query into the template
+_SEARCH_SYSTEM_PROMPT = "You are a web search expert. Provide comprehensive search results."
+_SEARCH_PROMPT_TMPL = """Search the web for: {query}
+
+Provide comprehensive information including:
+- Key findings and insights
+- Recent developments
+- Expert opinions
+- Statistical data if available
+- Multiple perspectives on the topic
+
+Format your response as a detailed research summary.
+"""
+
+# Seconds a cached search result stays valid when a request sets no TTL of its own
+DEFAULT_CACHE_TTL = 3600
+
+# Model that runs web searches, and the most characters kept per result snippet
+_SEARCH_MODEL = "gpt-4o-mini"
+_SNIPPET_LENGTH = 200
+
 
 class SearchRequest(BaseModel):
     """Request model for web search"""
     query: str = Field(..., description="Search query")
-    max_results: int = Field(default=10, description="Maximum number of results")
+    max_results: int = Field(default=10, ge=1, description="Maximum number of results")
     language: str = Field(default="en", description="Search language")
     region: str = Field(default="us", description="Search region")
+    ttl_seconds: Optional[int] = Field(default=None, ge=0, description="How long results stay cached; defaults to the tool's cache TTL")
 
 
 class SearchResult(BaseModel):
@@ -29,9 +69,52 @@ class SearchResult(BaseModel):
 class WebSearchTool:
     """Tool for performing web searches using OpenAI's WebSearchTool"""
     
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    _instance: Optional["WebSearchTool"] = None
+    
+    def __init__(
+        self,
+        max_concurrent_searches: int = 5,
+        cache_size: int = 512,
+        cache_ttl: int = DEFAULT_CACHE_TTL,
+        semantic_cache_threshold: Optional[float] = None,
+        semantic_cache_size: int = 1024
+    ):
+        """
+        Args:
+            max_concurrent_searches: Maximum number of search API calls in flight
+            cache_size: Maximum number of exact-match cache entries
+            cache_ttl: Seconds a cached result stays valid for requests without ttl_seconds
+            semantic_cache_threshold: Cosine similarity above which a cached
+                result for a differently worded query is reused; None disables
+                the semantic cache, which costs one embedding call per miss
+            semantic_cache_size: Maximum number of semantic cache entries
+        """
+        if semantic_cache_threshold is not None and np is None:
+            raise ImportError("numpy is required for the semantic search cache")
+        
+        self.client = _get_client()
         self.tool_name = "WebSearchTool"
+        # Caps in-flight API calls so concurrent searches stay within rate limits
+        self._semaphore = asyncio.Semaphore(max_concurrent_searches)
+        # Exact-match LRU of recent results: key -> (wall-clock fetch time, results).
+        # Freshness is checked against each requester's TTL, not the storer's
+        self._cache: "OrderedDict[str, Tuple[float, List[SearchResult]]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        # Semantic cache: unit query embeddings in a ring buffer, with a
+        # parallel list of (wall-clock fetch time, search parameters, results) entries
+        self._semantic_threshold = semantic_cache_threshold
+        self._semantic_size = semantic_cache_size
+        self._semantic_vectors = None
+        self._semantic_entries: List[Tuple[float, tuple, List[SearchResult]]] = []
+        self._semantic_next = 0
+    
+    @classmethod
+    def instance(cls) -> "WebSearchTool":
+        """Get the shared WebSearchTool, creating it on first use"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
     
     async def search(self, request: SearchRequest) -> List[SearchResult]:
         """
@@ -43,55 +126,270 @@ class WebSearchTool:
         Returns:
             List of search results
         """
-        try:
-            # Note: This is a placeholder for the actual WebSearchTool implementation
-            # In practice, you would use OpenAI's WebSearchTool here
-            search_prompt = f"""
-            Search the web for: {request.query}
-            
-            Provide comprehensive information including:
-            - Key findings and insights
-            - Recent developments
-            - Expert opinions
-            - Statistical data if available
-            - Multiple perspectives on the topic
-            
-            Format your response as a detailed research summary.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a web search expert. Provide comprehensive search results."},
-                    {"role": "user", "content": search_prompt}
-                ],
-                temperature=0.3
-            )
-            
-            # Simulate search results (in practice, you'd parse actual web search results)
-            results = [
-                SearchResult(
-                    title=f"Search Result 1 for {request.query}",
-                    url="https://example.com/result1",
-                    snippet=response.choices[0].message.content[:200] + "...",
-                    relevance_score=0.9
-                ),
-                SearchResult(
-                    title=f"Search Result 2 for {request.query}",
-                    url="https://example.com/result2", 
-                    snippet=response.choices[0].message.content[200:400] + "...",
-                    relevance_score=0.8
-                )
-            ]
+        _, results = await self.search_with_fetch_time(request)
+        return results
+    
+    async def search_with_fetch_time(self, request: SearchRequest) -> Tuple[float, List[SearchResult]]:
+        """
+        Perform a web search, also reporting when its results were fetched
+
+        Args:
+            request: Search request parameters
+
+        Returns:
+            Wall-clock time the results were fetched, which is earlier than
+            now for cached results, and the list of search results
+        """
+        cache_key = self._cache_key(request)
+        cached = self._cache_lookup(cache_key, request)
+        if cached is not None:
+            return cached
+        
+        query_vector = None
+        if self._semantic_threshold is not None:
+            query_vector = await self._embed_query(request.query)
+            cached = self._semantic_lookup(query_vector, request)
+            if cached is not None:
+                # Keep the original fetch time so a hit never extends the results' lifetime
+                fetched_at, results = cached
+                self._cache_store(cache_key, fetched_at, results)
+                return fetched_at, list(results)
+        
+        async with self._semaphore:
+            response = await self.client.responses.create(**self._request_body(request))
+        fetched_at = time.time()
+        
+        results = self._parse_results(request, response)
+        
+        self._cache_store(cache_key, fetched_at, results)
+        if query_vector is not None:
+            self._semantic_store(query_vector, request, fetched_at, results)
+        
+        return fetched_at, list(results)
+    
+    async def search_batch(
+        self,
+        requests: List[SearchRequest],
+        poll_interval: float = 30.0
+    ) -> List[Union[Tuple[float, List[SearchResult]], Exception]]:
+        """
+        Perform web searches through the OpenAI Batch API
+
+        Batch jobs cost half as much as online calls and are not bound by
+        the online rate limits, but may take up to 24 hours, so this is
+        meant for offline research runs. Cached queries are answered
+        without a job, and any search the job does not return, including
+        all of them if the API fails the job, is retried online.
+
+        Args:
+            requests: Search requests to run
+            poll_interval: Seconds between batch status checks
+
+        Returns:
+            Fetch time and list of search results for each request, in
+            request order, as returned by search_with_fetch_time, or the
+            exception raised by a search that failed
+        """
+        results: List[Optional[Union[Tuple[float, List[SearchResult]], Exception]]] = [None] * len(requests)
+        pending = {}
+        for i, request in enumerate(requests):
+            results[i] = self._cache_lookup(self._cache_key(request), request)
+            if results[i] is None:
+                pending[str(i)] = request
+        
+        if pending:
+            try:
+                batch = await self._run_batch_job(pending, poll_interval)
+                if batch.status == "completed" and batch.output_file_id:
+                    output = await self.client.files.content(batch.output_file_id)
+                else:
+                    logger.warning(
+                        "Batch web search job %s ended %s; running %d searches online",
+                        batch.id, batch.status, len(pending)
+                    )
+                    batch = None
+            except APIError as e:
+                # The batch job is only a cost optimization; its searches run online instead
+                logger.warning("Batch web search job failed (%s); running %d searches online", e, len(pending))
+                batch = None
             
-            return results
+            if batch is not None:
+                # Searches ran somewhere inside the job, so date them from its
+                # creation to never overstate their freshness
+                fetched_at = float(batch.created_at)
+                for line in output.text.splitlines():
+                    record = json.loads(line)
+                    request = pending.get(record.get("custom_id"))
+                    response = record.get("response") or {}
+                    if request is None or response.get("status_code") != 200:
+                        continue
+                    
+                    search_results = self._parse_results(request, Response.model_validate(response["body"]))
+                    self._cache_store(self._cache_key(request), fetched_at, search_results)
+                    results[int(record["custom_id"])] = (fetched_at, list(search_results))
+        
+        # Searches not answered by the job run online concurrently; one that
+        # fails there too is returned as its exception
+        missing = [i for i, result in enumerate(results) if result is None]
+        fallbacks = await asyncio.gather(
+            *(self.search_with_fetch_time(requests[i]) for i in missing),
+            return_exceptions=True
+        )
+        for i, result in zip(missing, fallbacks):
+            results[i] = result
+        
+        return results
+    
+    async def _run_batch_job(self, pending: Dict[str, SearchRequest], poll_interval: float):
+        """Submit pending searches as one Batch API job and poll until it stops running"""
+        batch_input = "".join(
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": self._request_body(request)
+            }) + "\n"
+            for custom_id, request in pending.items()
+        )
+        input_file = await self.client.files.create(
+            file=("web_searches.jsonl", batch_input.encode()),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/responses",
+            completion_window="24h"
+        )
+        
+        while batch.status in ("validating", "in_progress", "finalizing"):
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        return batch
+    
+    def _cache_key(self, request: SearchRequest) -> str:
+        """Exact-match cache key for a search request"""
+        return hashlib.blake2b(
+            f"{request.query}|{request.language}|{request.region}|{request.max_results}".encode()
+        ).hexdigest()
+    
+    def _request_body(self, request: SearchRequest) -> dict:
+        """Responses API arguments for a search request, shared by online and batch searches"""
+        return {
+            "model": _SEARCH_MODEL,
+            "tools": [{"type": "web_search_preview"}],
+            "instructions": _SEARCH_SYSTEM_PROMPT,
+            "input": _SEARCH_PROMPT_TMPL.format(query=request.query)
+        }
+    
+    def _parse_results(self, request: SearchRequest, response: Response) -> List[SearchResult]:
+        """
+        Turn the URL citations in a web search response into search results
 
-        except Exception as e:
-            raise
+        Each cited URL becomes one result, in citation order, with the text
+        leading up to its first citation as the snippet. The API gives no
+        relevance score, so scores fall linearly with rank. A response
+        without citations becomes a single result holding its answer text.
+        """
+        results: List[SearchResult] = []
+        seen_urls = set()
+        for item in response.output:
+            if item.type != "message":
+                continue
+            for part in item.content:
+                if part.type != "output_text":
+                    continue
+                passage_start = 0
+                for annotation in part.annotations:
+                    if annotation.type != "url_citation":
+                        continue
+                    snippet = part.text[passage_start:annotation.start_index].strip()
+                    passage_start = annotation.end_index
+                    if annotation.url in seen_urls:
+                        continue
+                    seen_urls.add(annotation.url)
+                    results.append(SearchResult(
+                        title=annotation.title,
+                        url=annotation.url,
+                        snippet=snippet[-_SNIPPET_LENGTH:] or annotation.title,
+                        relevance_score=1.0 - len(results) / request.max_results
+                    ))
+                    if len(results) == request.max_results:
+                        return results
+        
+        if not results and response.output_text:
+            results.append(SearchResult(
+                title=f"Search summary for {request.query}",
+                url="",
+                snippet=response.output_text[:_SNIPPET_LENGTH],
+                relevance_score=1.0
+            ))
+        return results
+    
+    def _ttl(self, request: SearchRequest) -> int:
+        """Seconds a request accepts cached results for"""
+        return self._cache_ttl if request.ttl_seconds is None else request.ttl_seconds
+    
+    def _cache_lookup(self, cache_key: str, request: SearchRequest) -> Optional[Tuple[float, List[SearchResult]]]:
+        """Return the cached fetch time and results if they are fresh enough for the request"""
+        cached = self._cache.get(cache_key)
+        if cached is None or cached[0] + self._ttl(request) <= time.time():
+            return None
+        self._cache.move_to_end(cache_key)
+        return cached[0], list(cached[1])
+    
+    def _cache_store(self, cache_key: str, fetched_at: float, results: List[SearchResult]):
+        """Add results to the exact-match cache, evicting the least recently used entry"""
+        self._cache[cache_key] = (fetched_at, results)
+        self._cache.move_to_end(cache_key)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+    
+    async def _embed_query(self, query: str):
+        """Embed a query as a unit vector, or return None if embedding fails"""
+        try:
+            response = await self.client.embeddings.create(model=_EMBEDDING_MODEL, input=query)
+        except Exception:
+            # The semantic cache is only an optimization; fall back to a real search
+            return None
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+    
+    def _semantic_lookup(self, query_vector, request: SearchRequest) -> Optional[Tuple[float, List[SearchResult]]]:
+        """Return the fetch time and results for the most similar earlier query, if similar and fresh enough"""
+        if query_vector is None or not self._semantic_entries:
+            return None
+        
+        similarities = self._semantic_vectors[:len(self._semantic_entries)] @ query_vector
+        best = int(similarities.argmax())
+        fetched_at, params, results = self._semantic_entries[best]
+        if (
+            similarities[best] >= self._semantic_threshold
+            and fetched_at + self._ttl(request) > time.time()
+            and params == (request.language, request.region, request.max_results)
+        ):
+            return fetched_at, results
+        return None
+    
+    def _semantic_store(self, query_vector, request: SearchRequest, fetched_at: float, results: List[SearchResult]):
+        """Add a query embedding and its results, overwriting the oldest entry when full"""
+        if self._semantic_vectors is None:
+            self._semantic_vectors = np.empty((self._semantic_size, query_vector.shape[0]), dtype=np.float32)
+        
+        entry = (
+            fetched_at,
+            (request.language, request.region, request.max_results),
+            results
+        )
+        self._semantic_vectors[self._semantic_next] = query_vector
+        if len(self._semantic_entries) < self._semantic_size:
+            self._semantic_entries.append(entry)
+        else:
+            self._semantic_entries[self._semantic_next] = entry
+        self._semantic_next = (self._semantic_next + 1) % self._semantic_size
     
     async def search_multiple(self, queries: List[str]) -> Dict[str, List[SearchResult]]:
         """
-        Perform multiple web searches
+        Perform multiple web searches concurrently
         
         Args:
             queries: List of search queries
@@ -99,13 +397,8 @@ class WebSearchTool:
         Returns:
             Dictionary mapping queries to their results
         """
-        try:
-            results = {}
-            for query in queries:
-                request = SearchRequest(query=query)
-                results[query] = await self.search(request)
-            
-            return results
-            
-        except Exception as e:
-            raise
+        results_list = await asyncio.gather(
+            *(self.search(SearchRequest(query=query)) for query in queries)
+        )
+        
+        return dict(zip(queries, results_list))
@@ -3,7 +3,6 @@ Main application entry point for Intelligent Research Synthesizer
 """
 import os
 from dotenv import load_dotenv
-from intelligent_agents.deep_research_agent import DeepResearchAgent
 
 
 def main():
@@ -31,6 +30,10 @@ def main():
     
     print("✅ API keys found")
     
+    # Import the agent only once the keys check out, so an early exit does
+    # not pay for loading Gradio, the OpenAI SDK and the agent graph
+    from intelligent_agents.deep_research_agent import DeepResearchAgent
+
     # Create and launch the deep research agent
     deep_research_agent = DeepResearchAgent()
     
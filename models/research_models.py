@@ -4,7 +4,20 @@ Pydantic models for the Intelligent Research Synthesizer
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional, Literal
 from datetime import datetime
-from enum import Enum
+import time
+
+
+# Last whole second seen by now_cached, with its datetime
+_last_dt = (0, None)
+
+
+def now_cached() -> datetime:
+    """Current local time at one-second resolution, built once per second"""
+    global _last_dt
+    now = int(time.time())
+    if now != _last_dt[0]:
+        _last_dt = (now, datetime.fromtimestamp(now))
+    return _last_dt[1]
 
 
 class SearchQuery(BaseModel):
@@ -18,9 +31,11 @@ class SearchQuery(BaseModel):
 class SearchResult(BaseModel):
     """Model for a single search result"""
     query: str = Field(..., description="The original search query")
-    results: str = Field(..., description="The search results content")
-    status: Literal["success", "error"] = Field(..., description="Status of the search")
-    timestamp: datetime = Field(default_factory=datetime.now, description="When the search was performed")
+    results: List[str] = Field(..., description="The search result snippets")
+    status: Literal["success", "no_results", "error"] = Field(..., description="Status of the search")
+    timestamp: datetime = Field(default_factory=now_cached, description="When the search was performed")
+    ttl_seconds: Optional[int] = Field(None, description="How long the results stay fresh, in seconds")
+    expires_at: Optional[datetime] = Field(None, description="When the results should be treated as stale")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
 
@@ -30,7 +45,7 @@ class ValidationResult(BaseModel):
     issues: List[str] = Field(default_factory=list, description="List of issues found")
     message: str = Field(..., description="Validation message")
     confidence: float = Field(default=0.0, ge=0.0, le=1.0, description="Confidence score")
-    timestamp: datetime = Field(default_factory=datetime.now, description="When validation was performed")
+    timestamp: datetime = Field(default_factory=now_cached, description="When validation was performed")
 
 
 class ResearchReport(BaseModel):
@@ -42,7 +57,7 @@ class ResearchReport(BaseModel):
     recommendations: List[str] = Field(default_factory=list, description="Recommendations")
     sources: List[str] = Field(default_factory=list, description="Source references")
     confidence_score: float = Field(default=0.0, ge=0.0, le=1.0, description="Overall confidence score")
-    generated_at: datetime = Field(default_factory=datetime.now, description="When the report was generated")
+    generated_at: datetime = Field(default_factory=now_cached, description="When the report was generated")
     validation_result: Optional[ValidationResult] = Field(None, description="Content validation results")
 
 
@@ -52,4 +67,5 @@ class ResearchRequest(BaseModel):
     user_id: Optional[str] = Field(None, description="User identifier")
     max_searches: int = Field(default=2, ge=1, le=5, description="Maximum number of searches")
     include_validation: bool = Field(default=True, description="Whether to include content validation")
-    created_at: datetime = Field(default_factory=datetime.now, description="When the request was created")
+    batch_mode: bool = Field(default=False, description="Whether to run searches as one discounted, slower Batch API job")
+    created_at: datetime = Field(default_factory=now_cached, description="When the request was created")